@@ -14,6 +14,7 @@ import os
 import shutil
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
@@ -135,8 +136,9 @@ class ContainersTool:
         """JSON schema for tool parameters (read by orchestrator)."""
         return self.tool_definitions[0]["input_schema"]
 
-    @property
+    @cached_property
     def tool_definitions(self) -> list[dict[str, Any]]:
+        """Tool schema; static, so built once per instance."""
         return [
             {
                 "name": "containers",
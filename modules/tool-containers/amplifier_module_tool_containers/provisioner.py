@@ -4,14 +4,16 @@ from __future__ import annotations
 
 import asyncio
 import fnmatch
+import itertools
 import os
+import posixpath
 import shutil
 from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from .runtime import ContainerRuntime
+    from .runtime import CommandResult, ContainerRuntime
 
 
 @dataclass
@@ -68,6 +70,16 @@ DEFAULT_ENV_PATTERNS = [
     "no_proxy",
 ]
 
+MAX_CONCURRENT_CLONES = 4
+
+
+def _paths_overlap(paths: list[str]) -> bool:
+    """Return True if any two paths are equal or one is nested inside another."""
+    # After sorting, a path that contains another sorts directly after it
+    # (or after a path that is itself inside it), so adjacent pairs suffice.
+    normalized = sorted(posixpath.normpath(path).rstrip("/") + "/" for path in paths)
+    return any(b.startswith(a) for a, b in itertools.pairwise(normalized))
+
 
 def match_env_patterns(env: dict[str, str], patterns: list[str]) -> dict[str, str]:
     """Return env vars whose keys match any of the glob patterns."""
@@ -383,11 +395,26 @@ class ContainerProvisioner:
         """Forward Amplifier settings into the container."""
         home = Path.home()
         amplifier_dir = home / ".amplifier"
-        if not amplifier_dir.exists():
+        if not amplifier_dir.is_dir():
             return ProvisioningStep(
                 "amplifier_settings", "skipped", "No ~/.amplifier directory on host"
             )
 
+        # Find the settings files before touching the container
+        candidates = ["settings.yaml", "settings.local.yaml"]
+        try:
+            with os.scandir(amplifier_dir) as entries:
+                present = {entry.name for entry in entries}
+            settings_files = [name for name in candidates if name in present]
+        except OSError:
+            # Searchable but not listable (e.g. mode 0311): probe each file directly
+            settings_files = [name for name in candidates if (amplifier_dir / name).exists()]
+
+        if not settings_files:
+            return ProvisioningStep(
+                "amplifier_settings", "skipped", "No settings files found in ~/.amplifier"
+            )
+
         target = await self.get_container_home(container, target_home=target_home)
 
         # Create target directory
@@ -401,21 +428,16 @@ class ContainerProvisioner:
         )
 
         files_copied = []
-        for settings_file in ["settings.yaml", "settings.local.yaml"]:
+        for settings_file in settings_files:
             src = amplifier_dir / settings_file
-            if src.exists():
-                await self.runtime.run(
-                    "cp",
-                    str(src),
-                    f"{container}:{target}/.amplifier/{settings_file}",
-                    timeout=10,
-                )
-                files_copied.append(settings_file)
-
-        if not files_copied:
-            return ProvisioningStep(
-                "amplifier_settings", "skipped", "No settings files found in ~/.amplifier"
+            await self.runtime.run(
+                "cp",
+                str(src),
+                f"{container}:{target}/.amplifier/{settings_file}",
+                timeout=10,
             )
+            files_copied.append(settings_file)
+
         return ProvisioningStep(
             "amplifier_settings", "success", f"Copied {', '.join(files_copied)}"
         )
@@ -429,22 +451,44 @@ class ContainerProvisioner:
         if not repos:
             return ProvisioningStep("repos", "skipped", "No repos specified")
 
-        cloned: list[str] = []
-        failed: list[dict[str, str]] = []
+        specs: list[tuple[str, str, str | None]] = []
         for repo in repos:
             url = repo.get("url", "")
             path = repo.get("path", f"/workspace/{url.rstrip('/').split('/')[-1]}")
-            install = repo.get("install")
+            specs.append((url, path, repo.get("install")))
 
-            # Clone
-            clone_result = await self.runtime.run(
-                "exec",
-                container,
-                "/bin/sh",
-                "-c",
-                f"git clone {url} {path}",
-                timeout=120,
-            )
+        clone_limit = asyncio.Semaphore(MAX_CONCURRENT_CLONES)
+
+        async def clone(url: str, path: str) -> CommandResult:
+            async with clone_limit:
+                return await self.runtime.run(
+                    "exec",
+                    container,
+                    "/bin/sh",
+                    "-c",
+                    f"git clone {url} {path}",
+                    timeout=120,
+                )
+
+        if _paths_overlap([path for _, path, _ in specs]):
+            # Two repos target the same or nested paths (e.g. two repos named
+            # "utils"); clone one at a time so the first one listed wins.
+            clone_results = [await clone(url, path) for url, path, _ in specs]
+        else:
+            # Clones are independent, so run them concurrently. An unexpected exception
+            # cancels the rest; re-raise it unwrapped so create() reports the real cause.
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    clone_tasks = [tg.create_task(clone(url, path)) for url, path, _ in specs]
+            except ExceptionGroup as eg:
+                raise eg.exceptions[0] from None
+            clone_results = [task.result() for task in clone_tasks]
+
+        # Installs share the container's environment and may depend on an earlier
+        # repo, so they run one at a time in input order once all clones are done.
+        cloned: list[str] = []
+        failed: list[dict[str, str]] = []
+        for (url, path, install), clone_result in zip(specs, clone_results):
             if clone_result.returncode != 0:
                 failed.append({"url": url, "error": clone_result.stderr.strip()})
                 continue
@@ -496,6 +540,20 @@ class ContainerProvisioner:
         if not config_files:
             return ProvisioningStep("config_files", "skipped", "No config files specified")
 
+        # Create every distinct parent directory with a single mkdir up front
+        parents = dict.fromkeys(posixpath.dirname(path) or "." for path in config_files)
+        mkdir_result = await self.runtime.run(
+            "exec",
+            container,
+            "/bin/sh",
+            "-c",
+            "mkdir -p " + " ".join(f"'{parent}'" for parent in parents),
+            timeout=10,
+        )
+        # mkdir -p keeps going past a parent it can't create; attach its stderr to the
+        # writes that then fail, rather than reporting only cat's "No such file"
+        mkdir_error = mkdir_result.stderr.strip() if mkdir_result.returncode != 0 else ""
+
         written: list[str] = []
         failed: list[dict[str, str]] = []
         for path, content in config_files.items():
@@ -504,13 +562,16 @@ class ContainerProvisioner:
                 container,
                 "/bin/sh",
                 "-c",
-                f"mkdir -p $(dirname '{path}') && cat > '{path}' << 'AMPLIFIER_CONFIG_EOF'\n{content}\nAMPLIFIER_CONFIG_EOF",
+                f"cat > '{path}' << 'AMPLIFIER_CONFIG_EOF'\n{content}\nAMPLIFIER_CONFIG_EOF",
                 timeout=10,
             )
             if result.returncode == 0:
                 written.append(path)
             else:
-                failed.append({"path": path, "error": result.stderr.strip()})
+                error = result.stderr.strip()
+                if mkdir_error:
+                    error = f"{error} (mkdir failed: {mkdir_error})"
+                failed.append({"path": path, "error": error})
 
         if failed and not written:
             return ProvisioningStep(
@@ -7,9 +7,9 @@ import shutil
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CommandResult:
-    """Result of a container runtime command."""
+    """Result of a container runtime command (immutable, so instances can be shared)."""
 
     returncode: int
     stdout: str
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import shutil
 import sys
 from pathlib import Path
 
@@ -14,6 +15,44 @@ from amplifier_module_tool_containers import ContainersTool, MetadataStore
 from amplifier_module_tool_containers.runtime import CommandResult, ContainerRuntime
 
 
+class _MissingHostFile:
+    """Stand-in for a host file (e.g. ~/.gitconfig) that does not exist."""
+
+    __slots__ = ()
+
+    def exists(self) -> bool:
+        return False
+
+    def is_dir(self) -> bool:
+        return False
+
+    def __str__(self) -> str:
+        return "/fake/.gitconfig"
+
+
+_MISSING_HOST_FILE = _MissingHostFile()
+
+
+class _FakeHome:
+    """Stand-in for ``Path.home()`` in which every child path is missing."""
+
+    __slots__ = ()
+
+    def __truediv__(self, key: str) -> _MissingHostFile:
+        return _MISSING_HOST_FILE
+
+
+_FAKE_HOME = _FakeHome()
+
+
+class _FakePath:
+    """Replacement for the provisioner's ``Path`` exposing only ``home()``."""
+
+    @staticmethod
+    def home() -> _FakeHome:
+        return _FAKE_HOME
+
+
 @pytest.fixture
 def mock_runtime():
     """ContainerRuntime with docker pre-cached (no real detection)."""
@@ -32,22 +71,43 @@ def mock_successful_run():
     return _run
 
 
-@pytest.fixture
-def tool(tmp_path):
-    """ContainersTool with a tmp_path-backed MetadataStore and mocked runtime."""
+@pytest.fixture(scope="session")
+def _session_tool(tmp_path_factory):
+    """One ContainersTool per session; the ``tool`` fixture resets it for each test."""
     t = ContainersTool()
-    t.store = MetadataStore(base_dir=tmp_path)
-    runtime = ContainerRuntime()
-    runtime._runtime = "docker"
-    t.runtime = runtime
-    # Keep provisioner in sync with the replaced runtime
-    t.provisioner.runtime = runtime
+    t.store = MetadataStore(base_dir=tmp_path_factory.mktemp("tool-store"))
     # Bypass ToolResult wrapping so tests can assert on raw dicts
     t._wrap_result = lambda result: result
     return t
 
 
+@pytest.fixture
+def tool(_session_tool):
+    """ContainersTool with a clean tmp-backed MetadataStore and docker pre-cached."""
+    t = _session_tool
+    t._preflight_passed = False
+    # Fresh runtime drops per-test overrides such as ``tool.runtime.run = _mock``
+    t.runtime = ContainerRuntime()
+    t.runtime._runtime = "docker"
+    # Keep provisioner in sync with the runtime
+    t.provisioner.runtime = t.runtime
+    shutil.rmtree(t.store.containers_dir, ignore_errors=True)
+    return t
+
+
 @pytest.fixture
 def metadata_store(tmp_path):
     """MetadataStore rooted in a temporary directory."""
     return MetadataStore(base_dir=tmp_path)
+
+
+@pytest.fixture
+def no_shutil_which(monkeypatch):
+    """Make shutil.which find nothing (no docker/podman/gh on PATH)."""
+    monkeypatch.setattr("shutil.which", lambda *_: None)
+
+
+@pytest.fixture
+def no_user_files(monkeypatch, no_shutil_which):
+    """Hide the host's gh CLI and home-directory files from the provisioner."""
+    monkeypatch.setattr("amplifier_module_tool_containers.provisioner.Path", _FakePath)
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 from pathlib import Path
+from typing import NoReturn
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -292,6 +293,11 @@ async def test_detect_timeout_returns_general():
         await asyncio.sleep(999)
         return b"", b""
 
+    async def _timeout(aw, timeout: float) -> NoReturn:
+        # Close the never-awaited communicate() coroutine so it isn't reported as leaked
+        aw.close()
+        raise TimeoutError
+
     proc = MagicMock()
     proc.communicate = _slow_communicate
 
@@ -304,10 +310,7 @@ async def test_detect_timeout_returns_general():
             "amplifier_module_tool_containers.images.asyncio.create_subprocess_exec",
             return_value=proc,
         ),
-        patch(
-            "amplifier_module_tool_containers.images.asyncio.wait_for",
-            side_effect=asyncio.TimeoutError,
-        ),
+        patch("amplifier_module_tool_containers.images.asyncio.wait_for", new=_timeout),
         patch("amplifier_module_tool_containers.images._shutil.rmtree"),
     ):
         purpose, hints = await detect_repo_purpose("https://github.com/slow/repo.git")
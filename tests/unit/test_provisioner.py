@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
 from amplifier_module_tool_containers.provisioner import (
+    MAX_CONCURRENT_CLONES,
     ContainerProvisioner,
     ProvisioningStep,
     match_env_patterns,
@@ -1014,6 +1016,45 @@ async def test_provision_amplifier_settings_no_dir(tmp_path):
     assert "No ~/.amplifier" in step.detail
 
 
+@pytest.mark.asyncio
+async def test_provision_amplifier_settings_not_a_directory(tmp_path):
+    """provision_amplifier_settings skips when ~/.amplifier is a file, not a directory."""
+    (tmp_path / ".amplifier").write_text("not a directory\n")
+    prov = _make_provisioner()
+
+    with patch("amplifier_module_tool_containers.provisioner.Path") as mock_path:
+        mock_path.home.return_value = tmp_path
+        step = await prov.provision_amplifier_settings("c1")
+
+    assert step.name == "amplifier_settings"
+    assert step.status == "skipped"
+    assert "No ~/.amplifier" in step.detail
+
+
+@pytest.mark.asyncio
+async def test_provision_amplifier_settings_unreadable_dir(tmp_path):
+    """provision_amplifier_settings probes each file when ~/.amplifier cannot be listed."""
+    amp_dir = tmp_path / ".amplifier"
+    amp_dir.mkdir()
+    (amp_dir / "settings.yaml").write_text("provider: anthropic\n")
+    prov = _make_provisioner()
+    prov.runtime.run = AsyncMock(return_value=CommandResult(0, "/home/hostuser\n", ""))
+
+    with (
+        patch("amplifier_module_tool_containers.provisioner.Path") as mock_path,
+        patch(
+            "amplifier_module_tool_containers.provisioner.os.scandir",
+            side_effect=PermissionError(13, "Permission denied"),
+        ),
+    ):
+        mock_path.home.return_value = tmp_path
+        step = await prov.provision_amplifier_settings("c1", target_home="/home/hostuser")
+
+    assert step.name == "amplifier_settings"
+    assert step.status == "success"
+    assert step.detail == "Copied settings.yaml"
+
+
 @pytest.mark.asyncio
 async def test_provision_amplifier_settings_no_files(tmp_path):
     """provision_amplifier_settings skips when ~/.amplifier has no settings files."""
@@ -1032,6 +1073,8 @@ async def test_provision_amplifier_settings_no_files(tmp_path):
     assert step.name == "amplifier_settings"
     assert step.status == "skipped"
     assert "No settings files" in step.detail
+    # The host directory is checked before any container exec
+    prov.runtime.run.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -1115,6 +1158,144 @@ async def test_provision_repos_with_install():
     assert len(commands_run) == 2
 
 
+@pytest.mark.asyncio
+async def test_provision_repos_installs_run_sequentially_in_order():
+    """Installs run one at a time, in input order, after every clone has finished."""
+    runtime = ContainerRuntime()
+    runtime._runtime = "docker"
+    events: list[str] = []
+    active_installs = 0
+
+    async def _mock_run(*args, **kwargs):
+        nonlocal active_installs
+        command = args[-1]
+        if command.startswith("git clone"):
+            events.append("clone")
+        else:
+            active_installs += 1
+            assert active_installs == 1, "installs overlapped"
+            events.append(command)
+            await asyncio.sleep(0)  # yield so an overlapping install would be caught
+            active_installs -= 1
+        return CommandResult(returncode=0, stdout="", stderr="")
+
+    runtime.run = _mock_run  # type: ignore[assignment]
+    provisioner = ContainerProvisioner(runtime)
+
+    result = await provisioner.provision_repos(
+        "test-container",
+        [
+            {
+                "url": "https://github.com/user/a",
+                "path": "/workspace/a",
+                "install": "pip install -e .",
+            },
+            {
+                "url": "https://github.com/user/b",
+                "path": "/workspace/b",
+                "install": "pip install -e ../a",
+            },
+        ],
+    )
+    assert result.status == "success"
+    assert events == [
+        "clone",
+        "clone",
+        "cd /workspace/a && pip install -e .",
+        "cd /workspace/b && pip install -e ../a",
+    ]
+
+
+@pytest.mark.parametrize(
+    "repos",
+    [
+        pytest.param(
+            [{"url": "https://github.com/a/utils"}, {"url": "https://github.com/b/utils"}],
+            id="same-default-path",
+        ),
+        pytest.param(
+            [
+                {"url": "https://github.com/user/a", "path": "/workspace/a"},
+                {"url": "https://github.com/user/sub", "path": "/workspace/a/sub/"},
+            ],
+            id="nested-path",
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_provision_repos_overlapping_paths_clone_in_order(repos):
+    """Repos with equal or nested paths are cloned one at a time, first listed first."""
+    runtime = ContainerRuntime()
+    runtime._runtime = "docker"
+    clone_order: list[str] = []
+    active_clones = 0
+
+    async def _mock_run(*args, **kwargs):
+        nonlocal active_clones
+        active_clones += 1
+        assert active_clones == 1, "overlapping clones ran concurrently"
+        await asyncio.sleep(0)  # yield so an overlapping clone would be caught
+        active_clones -= 1
+        url = args[-1].split()[2]
+        clone_order.append(url)
+        if len(clone_order) > 1:
+            return CommandResult(returncode=128, stdout="", stderr="destination already exists")
+        return CommandResult(returncode=0, stdout="", stderr="")
+
+    runtime.run = _mock_run  # type: ignore[assignment]
+    provisioner = ContainerProvisioner(runtime)
+
+    result = await provisioner.provision_repos("test-container", repos)
+    assert clone_order == [repo["url"] for repo in repos]
+    assert result.status == "partial"
+    assert repos[1]["url"] in result.error
+    assert repos[0]["url"] not in result.error
+
+
+@pytest.mark.asyncio
+async def test_provision_repos_caps_concurrent_clones():
+    """No more than MAX_CONCURRENT_CLONES clones run at once."""
+    runtime = ContainerRuntime()
+    runtime._runtime = "docker"
+    active_clones = 0
+    peak_clones = 0
+
+    async def _mock_run(*args, **kwargs):
+        nonlocal active_clones, peak_clones
+        active_clones += 1
+        peak_clones = max(peak_clones, active_clones)
+        await asyncio.sleep(0)
+        active_clones -= 1
+        return CommandResult(returncode=0, stdout="", stderr="")
+
+    runtime.run = _mock_run  # type: ignore[assignment]
+    provisioner = ContainerProvisioner(runtime)
+
+    repos = [{"url": f"https://github.com/user/repo{i}"} for i in range(MAX_CONCURRENT_CLONES + 2)]
+    result = await provisioner.provision_repos("test-container", repos)
+    assert result.status == "success"
+    assert peak_clones == MAX_CONCURRENT_CLONES
+
+
+@pytest.mark.asyncio
+async def test_provision_repos_propagates_runtime_error_unwrapped():
+    """An exception from the runtime surfaces as itself, not as an ExceptionGroup."""
+    runtime = ContainerRuntime()
+    runtime._runtime = "docker"
+
+    async def _mock_run(*args, **kwargs):
+        raise RuntimeError("docker socket gone")
+
+    runtime.run = _mock_run  # type: ignore[assignment]
+    provisioner = ContainerProvisioner(runtime)
+
+    with pytest.raises(RuntimeError, match="^docker socket gone$"):
+        await provisioner.provision_repos(
+            "test-container",
+            [{"url": "https://github.com/user/a"}, {"url": "https://github.com/user/b"}],
+        )
+
+
 @pytest.mark.asyncio
 async def test_provision_repos_clone_failure():
     """provision_repos reports partial when one repo fails."""
@@ -1233,14 +1414,12 @@ async def test_provision_config_files_failure():
     """provision_config_files reports partial on failure."""
     runtime = ContainerRuntime()
     runtime._runtime = "docker"
-    call_count = 0
 
     async def _mock_run(*args, **kwargs):
-        nonlocal call_count
-        call_count += 1
-        if call_count == 1:
-            return CommandResult(returncode=0, stdout="", stderr="")
-        return CommandResult(returncode=1, stdout="", stderr="permission denied")
+        # Writing /root/b.yaml fails; the mkdir and the other write succeed
+        if "cat > '/root/b.yaml'" in args[-1]:
+            return CommandResult(returncode=1, stdout="", stderr="permission denied")
+        return CommandResult(returncode=0, stdout="", stderr="")
 
     runtime.run = _mock_run  # type: ignore[assignment]
     provisioner = ContainerProvisioner(runtime)
@@ -1253,6 +1432,39 @@ async def test_provision_config_files_failure():
         },
     )
     assert result.status == "partial"
+    assert "permission denied" in result.error
+    assert "mkdir failed" not in result.error
+
+
+@pytest.mark.asyncio
+async def test_provision_config_files_reports_mkdir_failure():
+    """A failed parent mkdir is reported on the writes that then fail."""
+    runtime = ContainerRuntime()
+    runtime._runtime = "docker"
+
+    async def _mock_run(*args, **kwargs):
+        command = args[-1]
+        if command.startswith("mkdir -p"):
+            return CommandResult(
+                returncode=1, stdout="", stderr="mkdir: cannot create directory '/etc/app'"
+            )
+        if "cat > '/etc/app/b.yaml'" in command:
+            return CommandResult(returncode=1, stdout="", stderr="No such file or directory")
+        return CommandResult(returncode=0, stdout="", stderr="")
+
+    runtime.run = _mock_run  # type: ignore[assignment]
+    provisioner = ContainerProvisioner(runtime)
+
+    result = await provisioner.provision_config_files(
+        "test-container",
+        {
+            "/workspace/a.yaml": "a\n",
+            "/etc/app/b.yaml": "b\n",
+        },
+    )
+    assert result.status == "partial"
+    assert "cannot create directory '/etc/app'" in result.error
+    assert "/workspace/a.yaml" not in result.error
 
 
 @pytest.mark.asyncio
@@ -1270,13 +1482,12 @@ async def test_provision_config_files_creates_dirs():
     """provision_config_files creates parent directories."""
     runtime = ContainerRuntime()
     runtime._runtime = "docker"
-    cmd_run = ""
+    mkdir_cmds: list[str] = []
 
     async def _mock_run(*args, **kwargs):
-        nonlocal cmd_run
         for a in args:
             if isinstance(a, str) and "mkdir" in a:
-                cmd_run = a
+                mkdir_cmds.append(a)
         return CommandResult(returncode=0, stdout="", stderr="")
 
     runtime.run = _mock_run  # type: ignore[assignment]
@@ -1286,6 +1497,9 @@ async def test_provision_config_files_creates_dirs():
         "test-container",
         {
             "/workspace/deep/nested/config.yaml": "test\n",
+            "/workspace/deep/nested/other.yaml": "test\n",
+            "/root/b.yaml": "b\n",
         },
     )
-    assert "mkdir -p" in cmd_run
+    # One mkdir exec covering each distinct parent exactly once
+    assert mkdir_cmds == ["mkdir -p '/workspace/deep/nested' '/root'"]
@@ -2,13 +2,116 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, patch
+import os
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
 
 import pytest
 
 from amplifier_module_tool_containers import ContainersTool
+from amplifier_module_tool_containers.images import get_profile_hash
 from amplifier_module_tool_containers.runtime import CommandResult
 
+# Profile hashes are pure functions of PURPOSE_PROFILES; compute once for the cache-hit mocks
+_PYTHON_PROFILE_HASH = get_profile_hash("python")
+
+# Shared runtime results for the mocks below (CommandResult is frozen, so reuse is safe)
+_OK_EMPTY = CommandResult(0, "", "")
+_OK_HOME = CommandResult(0, "/root\n", "")
+_OK_CID = CommandResult(0, "abc123def456\n", "")
+_FAIL_CMD = CommandResult(1, "", "command not found")
+_NO_IMAGE = CommandResult(1, "", "No such image")
+_OK_COMMIT = CommandResult(0, "sha256:abc\n", "")
+_OK_OUTPUT = CommandResult(0, "output\n", "")
+_OK_PID = CommandResult(0, "12345\n", "")
+# wait_healthy health-check results
+_READY = CommandResult(0, "ready", "")
+_REFUSED = CommandResult(1, "", "connection refused")
+
+# create payload with host forwarding and dotfiles off; merge per-test fields with ``|``
+_BASE_CREATE_PAYLOAD: dict[str, Any] = {
+    "operation": "create",
+    "forward_git": False,
+    "forward_gh": False,
+    "forward_ssh": False,
+    "dotfiles_skip": True,
+}
+
+
+class _ScriptedRuntime:
+    """Shared runtime.run stand-in for create tests, recording what it was asked.
+
+    ``run`` starts container ``abc123def456``; ``image inspect`` misses unless
+    ``image_hash`` is set; exec'd commands listed in ``failing_commands`` fail.
+    Everything else succeeds with ``/root`` on stdout.
+    """
+
+    def __init__(self) -> None:
+        # First call seen for each runtime subcommand, e.g. first_calls["run"]
+        self.first_calls: dict[str, tuple[str, ...]] = {}
+        self.exec_commands: list[str] = []
+        self.image_hash: str | None = None
+        self.failing_commands: set[str] = set()
+
+    async def run(self, *args: str, **kwargs: object) -> CommandResult:
+        op = args[0] if args else ""
+        self.first_calls.setdefault(op, args)
+        if op == "exec" and len(args) > 4:
+            self.exec_commands.append(args[4])
+            if args[4] in self.failing_commands:
+                return _FAIL_CMD
+        if op == "run":
+            return _OK_CID
+        if op == "image":
+            if self.image_hash is None:
+                return _NO_IMAGE
+            return CommandResult(0, f"{self.image_hash}\n", "")
+        if op == "commit":
+            return _OK_COMMIT
+        return _OK_HOME
+
+    @property
+    def exec_log(self) -> str:
+        """All exec'd commands as one newline-joined string, for substring checks."""
+        return "\n".join(self.exec_commands)
+
+    def call(self, op: str) -> tuple[str, ...]:
+        """Return the first recorded call for runtime subcommand ``op``."""
+        return self.first_calls[op]
+
+
+@pytest.fixture
+def scripted_run(tool: ContainersTool) -> _ScriptedRuntime:
+    """A _ScriptedRuntime installed on the tool with preflight already passed."""
+    runtime = _ScriptedRuntime()
+    tool.runtime.run = runtime.run  # type: ignore[assignment]
+    tool._preflight_passed = True
+    return runtime
+
+
+@pytest.fixture
+def fast_sleep(monkeypatch) -> list[float]:
+    """Make asyncio.sleep return immediately, recording requested delays.
+
+    The tool module has no local ``sleep`` reference, so this patches the global
+    ``asyncio.sleep`` process-wide for the duration of the test.
+    """
+    delays: list[float] = []
+
+    async def _sleep(delay: float, result: Any = None) -> Any:
+        delays.append(delay)
+        return result
+
+    monkeypatch.setattr("amplifier_module_tool_containers.asyncio.sleep", _sleep)
+    return delays
+
+
+@pytest.fixture(scope="session")
+def tool_schema(_session_tool: ContainersTool) -> dict[str, Any]:
+    """The containers tool input schema, built once for the schema tests."""
+    return _session_tool.tool_definitions[0]["input_schema"]
+
 
 # ---------------------------------------------------------------------------
 # Tool definitions
@@ -35,7 +138,6 @@ def test_tool_definitions_valid(tool: ContainersTool):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
 async def test_unknown_operation_returns_error(tool: ContainersTool):
     """execute with bad operation returns error dict."""
     result = await tool.execute({"operation": "teleport"})
@@ -48,24 +150,20 @@ async def test_unknown_operation_returns_error(tool: ContainersTool):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_preflight_all_pass(tool: ContainersTool):
+async def test_preflight_all_pass(tool: ContainersTool, mock_successful_run):
     """Mock runtime methods to all return success."""
-    tool.runtime.run = AsyncMock(return_value=CommandResult(0, "{}", ""))
-    tool.runtime.is_daemon_running = AsyncMock(return_value=True)
-    tool.runtime.user_has_permissions = AsyncMock(return_value=True)
+    # Daemon and permission checks go through runtime.run, so they pass too
+    tool.runtime.run = mock_successful_run
     result = await tool.execute({"operation": "preflight"})
     assert result["ready"] is True
     assert result["runtime"] == "docker"
     assert all(c["passed"] for c in result["checks"])
 
 
-@pytest.mark.asyncio
-async def test_preflight_no_runtime(tool: ContainersTool):
+async def test_preflight_no_runtime(tool: ContainersTool, no_shutil_which):
     """Mock detect() to return None."""
     tool.runtime._runtime = None  # Reset cache
-    with patch("shutil.which", return_value=None):
-        result = await tool.execute({"operation": "preflight"})
+    result = await tool.execute({"operation": "preflight"})
     assert result["ready"] is False
     assert result["runtime"] is None
 
@@ -75,66 +173,53 @@ async def test_preflight_no_runtime(tool: ContainersTool):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_auto_preflight_on_first_create(tool: ContainersTool):
+async def test_auto_preflight_on_first_create(tool: ContainersTool, no_shutil_which):
     """First create triggers preflight automatically; fails if runtime not ready."""
     tool._preflight_passed = False
     tool.runtime._runtime = None  # Force no runtime
-    with patch("shutil.which", return_value=None):
-        result = await tool.execute({"operation": "create", "name": "test"})
+    result = await tool.execute({"operation": "create", "name": "test"})
     assert "error" in result
     assert "not ready" in result["error"].lower()
 
 
 # ---------------------------------------------------------------------------
-# Exec validation
+# Required-parameter validation
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_exec_requires_container_and_command(tool: ContainersTool):
-    """Returns error if missing container or command."""
-    result = await tool.execute({"operation": "exec"})
-    assert "error" in result
-    assert "required" in result["error"].lower()
-
-    result = await tool.execute({"operation": "exec", "container": "c1"})
-    assert "error" in result
-
-    result = await tool.execute({"operation": "exec", "command": "ls"})
-    assert "error" in result
-
-
-# ---------------------------------------------------------------------------
-# Destroy all validation
-# ---------------------------------------------------------------------------
-
-
-@pytest.mark.asyncio
-async def test_destroy_all_requires_confirm(tool: ContainersTool):
-    """Returns error without confirm=true."""
-    result = await tool.execute({"operation": "destroy_all"})
-    assert "error" in result
-    assert "confirm" in result["error"].lower()
-
-
-# ---------------------------------------------------------------------------
-# Copy in validation
-# ---------------------------------------------------------------------------
-
-
-@pytest.mark.asyncio
-async def test_copy_in_requires_all_params(tool: ContainersTool):
-    """Returns error if missing any of container/host_path/container_path."""
-    result = await tool.execute(
-        {"operation": "copy_in", "container": "c1", "host_path": "/tmp/f"},
-    )
-    assert "error" in result
-
-    result = await tool.execute(
-        {"operation": "copy_in", "host_path": "/tmp/f", "container_path": "/dst"},
-    )
+@pytest.mark.parametrize(
+    ("payload", "expected"),
+    [
+        ({"operation": "exec"}, "required"),
+        ({"operation": "exec", "container": "c1"}, "required"),
+        ({"operation": "exec", "command": "ls"}, "required"),
+        ({"operation": "destroy_all"}, "confirm"),
+        ({"operation": "copy_in", "container": "c1", "host_path": "/tmp/f"}, "required"),
+        (
+            {"operation": "copy_in", "host_path": "/tmp/f", "container_path": "/dst"},
+            "required",
+        ),
+        ({"operation": "exec_background", "container": "test"}, "required"),
+        ({"operation": "exec_poll", "container": "test"}, "required"),
+        ({"operation": "wait_healthy", "container": "test-db"}, "required"),
+    ],
+    ids=[
+        "exec_neither",
+        "exec_no_command",
+        "exec_no_container",
+        "destroy_all_no_confirm",
+        "copy_in_no_container_path",
+        "copy_in_no_container",
+        "exec_background_no_command",
+        "exec_poll_no_job_id",
+        "wait_healthy_no_health_command",
+    ],
+)
+async def test_missing_required_params(tool: ContainersTool, payload, expected):
+    """Operations return an error naming what is missing."""
+    result = await tool.execute(payload)
     assert "error" in result
+    assert expected in result["error"].lower()
 
 
 # ---------------------------------------------------------------------------
@@ -142,116 +227,47 @@ async def test_copy_in_requires_all_params(tool: ContainersTool):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_list_empty(tool: ContainersTool):
+async def test_list_empty(tool: ContainersTool, mock_successful_run):
     """Returns empty list when no containers."""
-    tool.runtime.run = AsyncMock(return_value=CommandResult(0, "", ""))
+    tool.runtime.run = mock_successful_run
     result = await tool.execute({"operation": "list"})
     assert result["containers"] == []
     assert result["count"] == 0
 
 
 # ---------------------------------------------------------------------------
-# Provisioning report in create
+# Create scenarios: provisioning report and image cache
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_create_returns_provisioning_report(tool: ContainersTool):
-    """create operation returns provisioning_report in result."""
-    tool._preflight_passed = True
+@dataclass(frozen=True)
+class _CreateScenario:
+    """A create call against a scripted runtime, and the checks to run on its result."""
 
-    async def _mock_run(*args: str, **kwargs: object) -> CommandResult:
-        if args and args[0] == "run":
-            return CommandResult(0, "abc123def456\n", "")
-        return CommandResult(0, "/root\n", "")
+    payload: dict[str, Any]
+    # Receives the create result and the commands exec'd in the container
+    check: Callable[[dict[str, Any], list[str]], None]
+    image_hash: str | None = None
+    failing_commands: frozenset[str] = frozenset()
 
-    tool.runtime.run = _mock_run  # type: ignore[assignment]
-    tool.provisioner.runtime.run = _mock_run  # type: ignore[assignment]
-
-    # Patch out gh CLI and gitconfig so provisioning takes known paths
-    with (
-        patch("amplifier_module_tool_containers.provisioner.shutil.which", return_value=None),
-        patch("amplifier_module_tool_containers.provisioner.Path") as mock_path,
-    ):
-        mock_home = mock_path.home.return_value
-        no_file = type(
-            "FP", (), {"exists": lambda self: False, "__str__": lambda self: "/fake/.gitconfig"}
-        )()
-        mock_home.__truediv__ = lambda self, key: no_file
-
-        result = await tool.execute(
-            {
-                "operation": "create",
-                "name": "test-report",
-                "forward_git": True,
-                "forward_gh": True,
-                "forward_ssh": False,
-            },
-        )
 
+_REPORT_ENTRY_KEYS = frozenset({"name", "status", "detail", "error"})
+_EXPECTED_REPORT_STEPS = frozenset(
+    {"env_passthrough", "forward_git", "forward_gh", "forward_ssh", "dotfiles"}
+)
+
+
+def _check_report(result: dict[str, Any], executed_commands: list[str]) -> None:
     assert "provisioning_report" in result
     report = result["provisioning_report"]
     assert isinstance(report, list)
-    assert len(report) > 0
     # Each entry has the required keys
-    for entry in report:
-        assert "name" in entry
-        assert "status" in entry
-        assert "detail" in entry
-        assert "error" in entry
+    assert all(_REPORT_ENTRY_KEYS <= entry.keys() for entry in report)
     # Verify specific steps are present
-    step_names = [e["name"] for e in report]
-    assert "env_passthrough" in step_names
-    assert "forward_git" in step_names
-    assert "forward_gh" in step_names
-    assert "forward_ssh" in step_names
-    assert "dotfiles" in step_names
-
-
-@pytest.mark.asyncio
-async def test_provisioning_report_setup_command_partial(tool: ContainersTool):
-    """When some setup_commands fail, report shows partial status."""
-    tool._preflight_passed = True
-    call_count = 0
+    assert _EXPECTED_REPORT_STEPS <= {e["name"] for e in report}
 
-    async def _mock_run(*args: str, **kwargs: object) -> CommandResult:
-        nonlocal call_count
-        call_count += 1
-        if args and args[0] == "run":
-            return CommandResult(0, "abc123def456\n", "")
-        # Fail the second setup command (detect by the command content)
-        if args and len(args) >= 5 and args[0] == "exec":
-            cmd_str = args[4] if len(args) > 4 else ""
-            if cmd_str == "failing-command":
-                return CommandResult(1, "", "command not found")
-        return CommandResult(0, "/root\n", "")
-
-    tool.runtime.run = _mock_run  # type: ignore[assignment]
-    tool.provisioner.runtime.run = _mock_run  # type: ignore[assignment]
-
-    with (
-        patch("amplifier_module_tool_containers.provisioner.shutil.which", return_value=None),
-        patch("amplifier_module_tool_containers.provisioner.Path") as mock_path,
-    ):
-        mock_home = mock_path.home.return_value
-        no_file = type(
-            "FP", (), {"exists": lambda self: False, "__str__": lambda self: "/fake/.gitconfig"}
-        )()
-        mock_home.__truediv__ = lambda self, key: no_file
-
-        result = await tool.execute(
-            {
-                "operation": "create",
-                "name": "test-partial",
-                "forward_git": False,
-                "forward_gh": False,
-                "forward_ssh": False,
-                "dotfiles_skip": True,
-                "setup_commands": ["echo hello", "failing-command"],
-            },
-        )
 
+def _check_partial(result: dict[str, Any], executed_commands: list[str]) -> None:
     assert "provisioning_report" in result
     report = result["provisioning_report"]
     setup_step = next(e for e in report if e["name"] == "setup_commands")
@@ -260,133 +276,91 @@ async def test_provisioning_report_setup_command_partial(tool: ContainersTool):
     assert setup_step["error"] is not None
 
 
-# ---------------------------------------------------------------------------
-# Cache clear
-# ---------------------------------------------------------------------------
+def _check_no_cache(result: dict[str, Any], executed_commands: list[str]) -> None:
+    assert "cache_used" in result
+    assert result["cache_used"] is False  # No cache existed
 
 
-@pytest.mark.asyncio
-async def test_cache_clear_requires_no_params(tool: ContainersTool):
-    """cache_clear works without purpose (clears all)."""
-    # Mock: no cached images found
-    tool.runtime.run = AsyncMock(return_value=CommandResult(0, "", ""))
-    result = await tool.execute({"operation": "cache_clear"})
-    assert result["success"] is True
-    assert isinstance(result["cleared"], list)
-    assert "detail" in result
+def _check_cache_hit(result: dict[str, Any], executed_commands: list[str]) -> None:
+    assert result["cache_used"] is True
+    assert result["image"] == "amplifier-cache:python"
+    # Profile setup commands (apt-get, uv) should NOT have been executed
+    tokens = set().union(*(c.split() for c in executed_commands))
+    assert "apt-get" not in tokens
+    # User's explicit command should still have been executed
+    assert "echo user-cmd" in executed_commands
 
 
-@pytest.mark.asyncio
-async def test_cache_clear_specific_purpose(tool: ContainersTool):
-    """cache_clear with purpose targets a specific image."""
-    tool.runtime.run = AsyncMock(return_value=CommandResult(0, "", ""))
-    result = await tool.execute({"operation": "cache_clear", "purpose": "python"})
-    assert result["success"] is True
-    assert result["cleared"] == ["python"]
+_CREATE_SCENARIOS = {
+    # create operation returns provisioning_report in result
+    "provisioning_report": _CreateScenario(
+        payload={
+            "operation": "create",
+            "name": "test-report",
+            "forward_git": True,
+            "forward_gh": True,
+            "forward_ssh": False,
+        },
+        check=_check_report,
+    ),
+    # When some setup_commands fail, report shows partial status
+    "setup_command_partial": _CreateScenario(
+        payload=_BASE_CREATE_PAYLOAD
+        | {"name": "test-partial", "setup_commands": ["echo hello", "failing-command"]},
+        check=_check_partial,
+        failing_commands=frozenset({"failing-command"}),
+    ),
+    # create result includes cache_used field
+    "cache_miss": _CreateScenario(
+        payload=_BASE_CREATE_PAYLOAD | {"name": "test-cache-field", "purpose": "python"},
+        check=_check_no_cache,
+    ),
+    # create with a cached image sets cache_used=True and skips profile setup
+    "cache_hit": _CreateScenario(
+        payload=_BASE_CREATE_PAYLOAD
+        | {"name": "test-cache-hit", "purpose": "python", "setup_commands": ["echo user-cmd"]},
+        check=_check_cache_hit,
+        image_hash=_PYTHON_PROFILE_HASH,
+    ),
+}
+
+
+@pytest.mark.parametrize("scenario", list(_CREATE_SCENARIOS.values()), ids=list(_CREATE_SCENARIOS))
+async def test_create_scenario(
+    tool: ContainersTool, scripted_run, no_user_files, scenario: _CreateScenario
+):
+    """create against a scripted runtime produces the expected report and cache fields."""
+    scripted_run.image_hash = scenario.image_hash
+    scripted_run.failing_commands.update(scenario.failing_commands)
+
+    # Payloads are shared across runs and create mutates its input
+    result = await tool.execute(dict(scenario.payload))
+
+    scenario.check(result, scripted_run.exec_commands)
 
 
 # ---------------------------------------------------------------------------
-# Cache used in create result
+# Cache clear
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_create_result_includes_cache_used(tool: ContainersTool):
-    """create result includes cache_used field."""
-    tool._preflight_passed = True
-
-    async def _mock_run(*args: str, **kwargs: object) -> CommandResult:
-        if args and args[0] == "run":
-            return CommandResult(0, "abc123def456\n", "")
-        # Return failure for image inspect (no cache)
-        if args and args[0] == "image":
-            return CommandResult(1, "", "No such image")
-        # commit call succeeds
-        if args and args[0] == "commit":
-            return CommandResult(0, "sha256:abc\n", "")
-        return CommandResult(0, "/root\n", "")
-
-    tool.runtime.run = _mock_run  # type: ignore[assignment]
-    tool.provisioner.runtime.run = _mock_run  # type: ignore[assignment]
-
-    with (
-        patch("amplifier_module_tool_containers.provisioner.shutil.which", return_value=None),
-        patch("amplifier_module_tool_containers.provisioner.Path") as mock_path,
-    ):
-        mock_home = mock_path.home.return_value
-        no_file = type(
-            "FP", (), {"exists": lambda self: False, "__str__": lambda self: "/fake/.gitconfig"}
-        )()
-        mock_home.__truediv__ = lambda self, key: no_file
-
-        result = await tool.execute(
-            {
-                "operation": "create",
-                "name": "test-cache-field",
-                "purpose": "python",
-                "forward_git": False,
-                "forward_gh": False,
-                "forward_ssh": False,
-                "dotfiles_skip": True,
-            },
-        )
-
-    assert "cache_used" in result
-    assert result["cache_used"] is False  # No cache existed
-
-
-@pytest.mark.asyncio
-async def test_create_uses_cached_image(tool: ContainersTool):
-    """create with a cached image sets cache_used=True and skips profile setup."""
-    tool._preflight_passed = True
-    executed_commands: list[str] = []
-
-    async def _mock_run(*args: str, **kwargs: object) -> CommandResult:
-        # Track exec commands to verify profile setup is skipped
-        if args and args[0] == "exec" and len(args) > 4:
-            executed_commands.append(args[4])
-        if args and args[0] == "run":
-            return CommandResult(0, "abc123def456\n", "")
-        # Cache hit: image inspect returns matching hash
-        if args and args[0] == "image":
-            from amplifier_module_tool_containers.images import get_profile_hash
-
-            expected = get_profile_hash("python")
-            return CommandResult(0, f"{expected}\n", "")
-        return CommandResult(0, "/root\n", "")
-
-    tool.runtime.run = _mock_run  # type: ignore[assignment]
-    tool.provisioner.runtime.run = _mock_run  # type: ignore[assignment]
-
-    with (
-        patch("amplifier_module_tool_containers.provisioner.shutil.which", return_value=None),
-        patch("amplifier_module_tool_containers.provisioner.Path") as mock_path,
-    ):
-        mock_home = mock_path.home.return_value
-        no_file = type(
-            "FP", (), {"exists": lambda self: False, "__str__": lambda self: "/fake/.gitconfig"}
-        )()
-        mock_home.__truediv__ = lambda self, key: no_file
-
-        result = await tool.execute(
-            {
-                "operation": "create",
-                "name": "test-cache-hit",
-                "purpose": "python",
-                "forward_git": False,
-                "forward_gh": False,
-                "forward_ssh": False,
-                "dotfiles_skip": True,
-                "setup_commands": ["echo user-cmd"],
-            },
-        )
-
-    assert result["cache_used"] is True
-    assert result["image"] == "amplifier-cache:python"
-    # Profile setup commands (apt-get, uv) should NOT have been executed
-    assert not any("apt-get" in c for c in executed_commands)
-    # User's explicit command should still have been executed
-    assert "echo user-cmd" in executed_commands
+@pytest.mark.parametrize(
+    ("payload", "expected_cleared"),
+    [
+        # No purpose: clears all cached images (none found here)
+        ({"operation": "cache_clear"}, []),
+        # A purpose targets that specific image
+        ({"operation": "cache_clear", "purpose": "python"}, ["python"]),
+    ],
+    ids=["all", "specific_purpose"],
+)
+async def test_cache_clear(tool: ContainersTool, mock_successful_run, payload, expected_cleared):
+    """cache_clear works with or without a purpose."""
+    tool.runtime.run = mock_successful_run
+    result = await tool.execute(payload)
+    assert result["success"] is True
+    assert result["cleared"] == expected_cleared
+    assert "detail" in result
 
 
 # ---------------------------------------------------------------------------
@@ -394,7 +368,6 @@ async def test_create_uses_cached_image(tool: ContainersTool):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
 async def test_try_repo_requires_url(tool: ContainersTool):
     """try-repo purpose without repo_url returns error."""
     tool._preflight_passed = True
@@ -405,75 +378,44 @@ async def test_try_repo_requires_url(tool: ContainersTool):
     assert "repo_url" in result["error"]
 
 
-@pytest.mark.asyncio
-async def test_try_repo_adds_clone_to_setup(tool: ContainersTool):
+async def test_try_repo_adds_clone_to_setup(
+    tool: ContainersTool, scripted_run, no_user_files, monkeypatch
+):
     """try-repo adds git clone to setup_commands and resolves detected purpose."""
-    tool._preflight_passed = True
-    executed_commands: list[str] = []
 
-    async def _mock_run(*args: str, **kwargs: object) -> CommandResult:
-        if args and args[0] == "exec" and len(args) > 4:
-            executed_commands.append(args[4])
-        if args and args[0] == "run":
-            return CommandResult(0, "abc123def456\n", "")
-        # No cache
-        if args and args[0] == "image":
-            return CommandResult(1, "", "No such image")
-        # commit succeeds
-        if args and args[0] == "commit":
-            return CommandResult(0, "sha256:abc\n", "")
-        return CommandResult(0, "/root\n", "")
-
-    tool.runtime.run = _mock_run  # type: ignore[assignment]
-    tool.provisioner.runtime.run = _mock_run  # type: ignore[assignment]
-
-    with (
-        patch("amplifier_module_tool_containers.provisioner.shutil.which", return_value=None),
-        patch("amplifier_module_tool_containers.provisioner.Path") as mock_path,
-        patch(
-            "amplifier_module_tool_containers.images.detect_repo_purpose",
-            return_value=(
-                "python",
-                [
-                    'uv pip install -e ".[dev]" 2>/dev/null || pip install -e ".[dev]" 2>/dev/null || true'
-                ],
-            ),
-        ),
-    ):
-        mock_home = mock_path.home.return_value
-        no_file = type(
-            "FP", (), {"exists": lambda self: False, "__str__": lambda self: "/fake/.gitconfig"}
-        )()
-        mock_home.__truediv__ = lambda self, key: no_file
-
-        result = await tool.execute(
-            {
-                "operation": "create",
-                "name": "test-tryrepo",
-                "purpose": "try-repo",
-                "repo_url": "https://github.com/example/repo.git",
-                "forward_git": False,
-                "forward_gh": False,
-                "forward_ssh": False,
-                "dotfiles_skip": True,
-            },
+    async def _detect_repo_purpose(repo_url: str) -> tuple[str, list[str]]:
+        return (
+            "python",
+            [
+                'uv pip install -e ".[dev]" 2>/dev/null || pip install -e ".[dev]" 2>/dev/null || true'
+            ],
         )
 
+    monkeypatch.setattr(
+        "amplifier_module_tool_containers.images.detect_repo_purpose", _detect_repo_purpose
+    )
+    result = await tool.execute(
+        _BASE_CREATE_PAYLOAD
+        | {
+            "name": "test-tryrepo",
+            "purpose": "try-repo",
+            "repo_url": "https://github.com/example/repo.git",
+        },
+    )
+
     assert result.get("success") is True
     # Purpose should have been resolved to python (not try-repo)
     assert result["purpose"] == "python"
     # First setup command should be the git clone
-    assert any("git clone" in c for c in executed_commands)
-    assert any("https://github.com/example/repo.git" in c for c in executed_commands)
+    exec_log = scripted_run.exec_log
+    assert "git clone" in exec_log
+    assert "https://github.com/example/repo.git" in exec_log
 
 
-@pytest.mark.asyncio
-async def test_try_repo_schema_includes_repo_url(tool: ContainersTool):
+def test_try_repo_schema_includes_repo_url(tool_schema):
     """repo_url is present in the tool input schema."""
-    defs = tool.tool_definitions
-    schema = defs[0]["input_schema"]
-    assert "repo_url" in schema["properties"]
-    assert schema["properties"]["repo_url"]["type"] == "string"
+    assert "repo_url" in tool_schema["properties"]
+    assert tool_schema["properties"]["repo_url"]["type"] == "string"
 
 
 # ---------------------------------------------------------------------------
@@ -481,7 +423,6 @@ async def test_try_repo_schema_includes_repo_url(tool: ContainersTool):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
 async def test_exec_background_returns_job_id(tool: ContainersTool, mock_successful_run):
     """exec_background returns a job_id and pid."""
     tool.runtime.run = mock_successful_run
@@ -489,7 +430,7 @@ async def test_exec_background_returns_job_id(tool: ContainersTool, mock_success
 
     # Mock run to return a PID
     async def _bg_run(*args, **kwargs):
-        return CommandResult(returncode=0, stdout="12345\n", stderr="")
+        return _OK_PID
 
     tool.runtime.run = _bg_run
 
@@ -505,19 +446,6 @@ async def test_exec_background_returns_job_id(tool: ContainersTool, mock_success
     assert result["container"] == "test-container"
 
 
-@pytest.mark.asyncio
-async def test_exec_background_requires_container_and_command(tool: ContainersTool):
-    """exec_background returns error if container or command missing."""
-    result = await tool.execute(
-        {
-            "operation": "exec_background",
-            "container": "test",
-        },
-    )
-    assert "error" in result
-
-
-@pytest.mark.asyncio
 async def test_exec_poll_running(tool: ContainersTool):
     """exec_poll reports running=True when process is active."""
     call_count = 0
@@ -546,7 +474,6 @@ async def test_exec_poll_running(tool: ContainersTool):
     assert result["exit_code"] is None
 
 
-@pytest.mark.asyncio
 async def test_exec_poll_completed(tool: ContainersTool):
     """exec_poll reports running=False with exit_code when done."""
     call_count = 0
@@ -572,19 +499,6 @@ async def test_exec_poll_completed(tool: ContainersTool):
     assert result["exit_code"] == 0
 
 
-@pytest.mark.asyncio
-async def test_exec_poll_requires_container_and_job_id(tool: ContainersTool):
-    """exec_poll returns error if container or job_id missing."""
-    result = await tool.execute(
-        {
-            "operation": "exec_poll",
-            "container": "test",
-        },
-    )
-    assert "error" in result
-
-
-@pytest.mark.asyncio
 async def test_exec_cancel_returns_cancelled(tool: ContainersTool, mock_successful_run):
     """exec_cancel returns cancelled=True."""
     tool.runtime.run = mock_successful_run
@@ -604,163 +518,36 @@ async def test_exec_cancel_returns_cancelled(tool: ContainersTool, mock_successf
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_create_no_user_flag_on_run(tool: ContainersTool):
-    """docker run args do NOT contain --user (container runs as root)."""
-    tool._preflight_passed = True
-    captured_args: list[tuple[str, ...]] = []
-
-    async def _capture(*args: str, **kwargs: object) -> CommandResult:
-        captured_args.append(args)
-        if args and args[0] == "run":
-            return CommandResult(0, "abc123def456\n", "")
-        return CommandResult(0, "/root\n", "")
-
-    tool.runtime.run = _capture  # type: ignore[assignment]
-    tool.provisioner.runtime.run = _capture  # type: ignore[assignment]
-
-    with (
-        patch("amplifier_module_tool_containers.provisioner.shutil.which", return_value=None),
-        patch("amplifier_module_tool_containers.provisioner.Path") as mock_path,
-    ):
-        mock_home = mock_path.home.return_value
-        no_file = type(
-            "FP", (), {"exists": lambda self: False, "__str__": lambda self: "/fake/.gitconfig"}
-        )()
-        mock_home.__truediv__ = lambda self, key: no_file
-
-        await tool.execute(
-            {
-                "operation": "create",
-                "name": "test-no-user-run",
-                "forward_git": False,
-                "forward_gh": False,
-            },
-        )
+async def test_create_two_phase_user_setup(tool: ContainersTool, scripted_run, no_user_files):
+    """create runs the container as root, then maps the host user for later execs."""
+    await tool.execute(
+        {
+            "operation": "create",
+            "name": "test-two-phase",
+            "mount_cwd": True,
+            "forward_git": False,
+            "forward_gh": False,
+        },
+    )
 
-    run_call = next(c for c in captured_args if c and c[0] == "run")
+    run_call = scripted_run.call("run")
+    # docker run args do NOT contain --user (container runs as root)
     assert "--user" not in run_call
+    # No --cap-drop=ALL, but security-opt should still be present
+    assert "--cap-drop=ALL" not in run_call
+    assert "--security-opt=no-new-privileges" in run_call
 
+    # Host user/group are created during setup, and workspace ownership fixed afterwards
+    assert "useradd" in scripted_run.exec_log
+    assert "groupadd" in scripted_run.exec_log
+    assert any("chown" in cmd and "/workspace" in cmd for cmd in scripted_run.exec_commands)
 
-@pytest.mark.asyncio
-async def test_create_stores_exec_user_in_metadata(tool: ContainersTool):
-    """create stores exec_user in metadata."""
-    import os
-
-    tool._preflight_passed = True
-
-    async def _mock_run(*args: str, **kwargs: object) -> CommandResult:
-        if args and args[0] == "run":
-            return CommandResult(0, "abc123def456\n", "")
-        return CommandResult(0, "/root\n", "")
-
-    tool.runtime.run = _mock_run  # type: ignore[assignment]
-    tool.provisioner.runtime.run = _mock_run  # type: ignore[assignment]
-
-    with (
-        patch("amplifier_module_tool_containers.provisioner.shutil.which", return_value=None),
-        patch("amplifier_module_tool_containers.provisioner.Path") as mock_path,
-    ):
-        mock_home = mock_path.home.return_value
-        no_file = type(
-            "FP", (), {"exists": lambda self: False, "__str__": lambda self: "/fake/.gitconfig"}
-        )()
-        mock_home.__truediv__ = lambda self, key: no_file
-
-        await tool.execute(
-            {
-                "operation": "create",
-                "name": "test-meta",
-                "mount_cwd": True,
-                "forward_git": False,
-                "forward_gh": False,
-            },
-        )
-
-    metadata = tool.store.load("test-meta")
+    # exec_user is stored in metadata
+    metadata = tool.store.load("test-two-phase")
     assert metadata is not None
-    assert "exec_user" in metadata
     assert metadata["exec_user"] == f"{os.getuid()}:{os.getgid()}"
 
 
-@pytest.mark.asyncio
-async def test_create_creates_hostuser(tool: ContainersTool):
-    """useradd command is called during container setup."""
-    tool._preflight_passed = True
-    exec_commands: list[str] = []
-
-    async def _capture(*args: str, **kwargs: object) -> CommandResult:
-        if args and args[0] == "exec" and len(args) > 4:
-            exec_commands.append(args[4])
-        if args and args[0] == "run":
-            return CommandResult(0, "abc123def456\n", "")
-        return CommandResult(0, "/root\n", "")
-
-    tool.runtime.run = _capture  # type: ignore[assignment]
-    tool.provisioner.runtime.run = _capture  # type: ignore[assignment]
-
-    with (
-        patch("amplifier_module_tool_containers.provisioner.shutil.which", return_value=None),
-        patch("amplifier_module_tool_containers.provisioner.Path") as mock_path,
-    ):
-        mock_home = mock_path.home.return_value
-        no_file = type(
-            "FP", (), {"exists": lambda self: False, "__str__": lambda self: "/fake/.gitconfig"}
-        )()
-        mock_home.__truediv__ = lambda self, key: no_file
-
-        await tool.execute(
-            {
-                "operation": "create",
-                "name": "test-hostuser",
-                "forward_git": False,
-                "forward_gh": False,
-            },
-        )
-
-    assert any("useradd" in cmd for cmd in exec_commands)
-    assert any("groupadd" in cmd for cmd in exec_commands)
-
-
-@pytest.mark.asyncio
-async def test_create_chowns_workspace(tool: ContainersTool):
-    """chown command runs after setup to fix workspace ownership."""
-    tool._preflight_passed = True
-    exec_commands: list[str] = []
-
-    async def _capture(*args: str, **kwargs: object) -> CommandResult:
-        if args and args[0] == "exec" and len(args) > 4:
-            exec_commands.append(args[4])
-        if args and args[0] == "run":
-            return CommandResult(0, "abc123def456\n", "")
-        return CommandResult(0, "/root\n", "")
-
-    tool.runtime.run = _capture  # type: ignore[assignment]
-    tool.provisioner.runtime.run = _capture  # type: ignore[assignment]
-
-    with (
-        patch("amplifier_module_tool_containers.provisioner.shutil.which", return_value=None),
-        patch("amplifier_module_tool_containers.provisioner.Path") as mock_path,
-    ):
-        mock_home = mock_path.home.return_value
-        no_file = type(
-            "FP", (), {"exists": lambda self: False, "__str__": lambda self: "/fake/.gitconfig"}
-        )()
-        mock_home.__truediv__ = lambda self, key: no_file
-
-        await tool.execute(
-            {
-                "operation": "create",
-                "name": "test-chown",
-                "forward_git": False,
-                "forward_gh": False,
-            },
-        )
-
-    assert any("chown" in cmd and "/workspace" in cmd for cmd in exec_commands)
-
-
-@pytest.mark.asyncio
 async def test_exec_uses_exec_user(tool: ContainersTool):
     """docker exec includes --user from metadata."""
     # Pre-save metadata with exec_user
@@ -770,7 +557,7 @@ async def test_exec_uses_exec_user(tool: ContainersTool):
 
     async def _capture(*args: str, **kwargs: object) -> CommandResult:
         captured_args.append(args)
-        return CommandResult(0, "output\n", "")
+        return _OK_OUTPUT
 
     tool.runtime.run = _capture  # type: ignore[assignment]
 
@@ -788,7 +575,6 @@ async def test_exec_uses_exec_user(tool: ContainersTool):
     assert exec_call[user_idx + 1] == "1000:1000"
 
 
-@pytest.mark.asyncio
 async def test_exec_as_root_skips_user(tool: ContainersTool):
     """as_root=True runs without --user."""
     tool.store.save("test-exec-root", {"exec_user": "1000:1000"})
@@ -797,7 +583,7 @@ async def test_exec_as_root_skips_user(tool: ContainersTool):
 
     async def _capture(*args: str, **kwargs: object) -> CommandResult:
         captured_args.append(args)
-        return CommandResult(0, "output\n", "")
+        return _OK_OUTPUT
 
     tool.runtime.run = _capture  # type: ignore[assignment]
 
@@ -814,7 +600,6 @@ async def test_exec_as_root_skips_user(tool: ContainersTool):
     assert "--user" not in exec_call
 
 
-@pytest.mark.asyncio
 async def test_exec_no_mounts_no_user(tool: ContainersTool):
     """mount_cwd=False with no mounts means no exec_user, so exec has no --user."""
     # Metadata without exec_user (simulates container created without mounts)
@@ -824,7 +609,7 @@ async def test_exec_no_mounts_no_user(tool: ContainersTool):
 
     async def _capture(*args: str, **kwargs: object) -> CommandResult:
         captured_args.append(args)
-        return CommandResult(0, "output\n", "")
+        return _OK_OUTPUT
 
     tool.runtime.run = _capture  # type: ignore[assignment]
 
@@ -840,14 +625,13 @@ async def test_exec_no_mounts_no_user(tool: ContainersTool):
     assert "--user" not in exec_call
 
 
-@pytest.mark.asyncio
 async def test_exec_interactive_hint_includes_user(tool: ContainersTool):
     """Interactive hint includes --user when exec_user is set."""
     tool.store.save("test-hint", {"exec_user": "1000:1000"})
 
     async def _mock_run(*args: str, **kwargs: object) -> CommandResult:
         # test -x /bin/bash succeeds
-        return CommandResult(0, "", "")
+        return _OK_EMPTY
 
     tool.runtime.run = _mock_run  # type: ignore[assignment]
 
@@ -861,7 +645,6 @@ async def test_exec_interactive_hint_includes_user(tool: ContainersTool):
     assert "--user 1000:1000" in result["command"]
 
 
-@pytest.mark.asyncio
 async def test_exec_background_uses_exec_user(tool: ContainersTool):
     """Background exec respects mapped user."""
     tool.store.save("test-bg", {"exec_user": "1000:1000"})
@@ -870,7 +653,7 @@ async def test_exec_background_uses_exec_user(tool: ContainersTool):
 
     async def _capture(*args: str, **kwargs: object) -> CommandResult:
         captured_args.append(args)
-        return CommandResult(0, "12345\n", "")
+        return _OK_PID
 
     tool.runtime.run = _capture  # type: ignore[assignment]
 
@@ -888,52 +671,10 @@ async def test_exec_background_uses_exec_user(tool: ContainersTool):
     assert exec_call[user_idx + 1] == "1000:1000"
 
 
-@pytest.mark.asyncio
-async def test_create_no_cap_drop_all(tool: ContainersTool):
-    """docker run args do NOT contain --cap-drop=ALL."""
-    tool._preflight_passed = True
-    captured_args: list[tuple[str, ...]] = []
-
-    async def _capture(*args: str, **kwargs: object) -> CommandResult:
-        captured_args.append(args)
-        if args and args[0] == "run":
-            return CommandResult(0, "abc123def456\n", "")
-        return CommandResult(0, "/root\n", "")
-
-    tool.runtime.run = _capture  # type: ignore[assignment]
-    tool.provisioner.runtime.run = _capture  # type: ignore[assignment]
-
-    with (
-        patch("amplifier_module_tool_containers.provisioner.shutil.which", return_value=None),
-        patch("amplifier_module_tool_containers.provisioner.Path") as mock_path,
-    ):
-        mock_home = mock_path.home.return_value
-        no_file = type(
-            "FP", (), {"exists": lambda self: False, "__str__": lambda self: "/fake/.gitconfig"}
-        )()
-        mock_home.__truediv__ = lambda self, key: no_file
-
-        await tool.execute(
-            {
-                "operation": "create",
-                "name": "test-no-cap",
-                "forward_git": False,
-                "forward_gh": False,
-            },
-        )
-
-    run_call = next(c for c in captured_args if c and c[0] == "run")
-    assert "--cap-drop=ALL" not in run_call
-    # But security-opt should still be present
-    assert "--security-opt=no-new-privileges" in run_call
-
-
-def test_as_root_in_schema(tool: ContainersTool):
+def test_as_root_in_schema(tool_schema):
     """as_root is in the tool input schema."""
-    defs = tool.tool_definitions
-    schema = defs[0]["input_schema"]
-    assert "as_root" in schema["properties"]
-    assert schema["properties"]["as_root"]["type"] == "boolean"
+    assert "as_root" in tool_schema["properties"]
+    assert tool_schema["properties"]["as_root"]["type"] == "boolean"
 
 
 # ---------------------------------------------------------------------------
@@ -941,162 +682,60 @@ def test_as_root_in_schema(tool: ContainersTool):
 # ---------------------------------------------------------------------------
 
 
-def test_amplifier_version_in_schema(tool: ContainersTool):
+def test_amplifier_version_in_schema(tool_schema):
     """amplifier_version is in tool_definitions."""
-    defs = tool.tool_definitions
-    schema = defs[0]["input_schema"]
-    assert "amplifier_version" in schema["properties"]
-    assert schema["properties"]["amplifier_version"]["type"] == "string"
+    assert "amplifier_version" in tool_schema["properties"]
+    assert tool_schema["properties"]["amplifier_version"]["type"] == "string"
 
 
-def test_amplifier_bundle_in_schema(tool: ContainersTool):
+def test_amplifier_bundle_in_schema(tool_schema):
     """amplifier_bundle is in tool_definitions."""
-    defs = tool.tool_definitions
-    schema = defs[0]["input_schema"]
-    assert "amplifier_bundle" in schema["properties"]
-    assert schema["properties"]["amplifier_bundle"]["type"] == "string"
+    assert "amplifier_bundle" in tool_schema["properties"]
+    assert tool_schema["properties"]["amplifier_bundle"]["type"] == "string"
 
 
-@pytest.mark.asyncio
-async def test_amplifier_version_modifies_install(tool: ContainersTool):
+async def test_amplifier_version_modifies_install(
+    tool: ContainersTool, scripted_run, no_user_files
+):
     """amplifier_version param pins the install version."""
-    tool._preflight_passed = True
-    executed_commands: list[str] = []
-
-    async def _mock_run(*args: str, **kwargs: object) -> CommandResult:
-        if args and args[0] == "exec" and len(args) > 4:
-            executed_commands.append(args[4])
-        if args and args[0] == "run":
-            return CommandResult(0, "abc123def456\n", "")
-        # No cache
-        if args and args[0] == "image":
-            return CommandResult(1, "", "No such image")
-        # commit succeeds
-        if args and args[0] == "commit":
-            return CommandResult(0, "sha256:abc\n", "")
-        return CommandResult(0, "/root\n", "")
-
-    tool.runtime.run = _mock_run  # type: ignore[assignment]
-    tool.provisioner.runtime.run = _mock_run  # type: ignore[assignment]
-
-    with (
-        patch("amplifier_module_tool_containers.provisioner.shutil.which", return_value=None),
-        patch("amplifier_module_tool_containers.provisioner.Path") as mock_path,
-    ):
-        mock_home = mock_path.home.return_value
-        no_file = type(
-            "FP", (), {"exists": lambda self: False, "__str__": lambda self: "/fake/.gitconfig"}
-        )()
-        mock_home.__truediv__ = lambda self, key: no_file
-
-        result = await tool.execute(
-            {
-                "operation": "create",
-                "name": "test-amp-ver",
-                "purpose": "amplifier",
-                "amplifier_version": "1.0.0",
-                "forward_git": False,
-                "forward_gh": False,
-                "forward_ssh": False,
-                "dotfiles_skip": True,
-            },
-        )
+    result = await tool.execute(
+        _BASE_CREATE_PAYLOAD
+        | {"name": "test-amp-ver", "purpose": "amplifier", "amplifier_version": "1.0.0"},
+    )
 
     assert result.get("success") is True
+    exec_log = scripted_run.exec_log
     # Verify the versioned install command was executed
-    assert any("amplifier==1.0.0" in cmd for cmd in executed_commands)
-    # Verify the unversioned command was NOT executed
-    assert not any(
-        "uv tool install amplifier" in cmd and "amplifier==" not in cmd for cmd in executed_commands
+    assert "amplifier==1.0.0" in exec_log
+    # Verify the unversioned command was NOT executed (every install is pinned)
+    assert exec_log.count("uv tool install amplifier") == exec_log.count(
+        "uv tool install amplifier=="
     )
 
 
-@pytest.mark.asyncio
-async def test_amplifier_bundle_adds_config_command(tool: ContainersTool):
+async def test_amplifier_bundle_adds_config_command(
+    tool: ContainersTool, scripted_run, no_user_files
+):
     """amplifier_bundle param adds bundle configuration command."""
-    tool._preflight_passed = True
-    executed_commands: list[str] = []
-
-    async def _mock_run(*args: str, **kwargs: object) -> CommandResult:
-        if args and args[0] == "exec" and len(args) > 4:
-            executed_commands.append(args[4])
-        if args and args[0] == "run":
-            return CommandResult(0, "abc123def456\n", "")
-        if args and args[0] == "image":
-            return CommandResult(1, "", "No such image")
-        if args and args[0] == "commit":
-            return CommandResult(0, "sha256:abc\n", "")
-        return CommandResult(0, "/root\n", "")
-
-    tool.runtime.run = _mock_run  # type: ignore[assignment]
-    tool.provisioner.runtime.run = _mock_run  # type: ignore[assignment]
-
-    with (
-        patch("amplifier_module_tool_containers.provisioner.shutil.which", return_value=None),
-        patch("amplifier_module_tool_containers.provisioner.Path") as mock_path,
-    ):
-        mock_home = mock_path.home.return_value
-        no_file = type(
-            "FP", (), {"exists": lambda self: False, "__str__": lambda self: "/fake/.gitconfig"}
-        )()
-        mock_home.__truediv__ = lambda self, key: no_file
-
-        result = await tool.execute(
-            {
-                "operation": "create",
-                "name": "test-amp-bundle",
-                "purpose": "amplifier",
-                "amplifier_bundle": "github:myorg/mybundle",
-                "forward_git": False,
-                "forward_gh": False,
-                "forward_ssh": False,
-                "dotfiles_skip": True,
-            },
-        )
+    result = await tool.execute(
+        _BASE_CREATE_PAYLOAD
+        | {
+            "name": "test-amp-bundle",
+            "purpose": "amplifier",
+            "amplifier_bundle": "github:myorg/mybundle",
+        },
+    )
 
     assert result.get("success") is True
     # Verify the bundle add command was executed
-    assert any("amplifier bundle add github:myorg/mybundle" in cmd for cmd in executed_commands)
+    assert "amplifier bundle add github:myorg/mybundle" in scripted_run.exec_log
 
 
-@pytest.mark.asyncio
-async def test_amplifier_settings_provisioned(tool: ContainersTool):
+async def test_amplifier_settings_provisioned(tool: ContainersTool, scripted_run, no_user_files):
     """amplifier purpose triggers provision_amplifier_settings."""
-    tool._preflight_passed = True
-
-    async def _mock_run(*args: str, **kwargs: object) -> CommandResult:
-        if args and args[0] == "run":
-            return CommandResult(0, "abc123def456\n", "")
-        if args and args[0] == "image":
-            return CommandResult(1, "", "No such image")
-        if args and args[0] == "commit":
-            return CommandResult(0, "sha256:abc\n", "")
-        return CommandResult(0, "/root\n", "")
-
-    tool.runtime.run = _mock_run  # type: ignore[assignment]
-    tool.provisioner.runtime.run = _mock_run  # type: ignore[assignment]
-
-    with (
-        patch("amplifier_module_tool_containers.provisioner.shutil.which", return_value=None),
-        patch("amplifier_module_tool_containers.provisioner.Path") as mock_path,
-    ):
-        mock_home = mock_path.home.return_value
-        no_file = type(
-            "FP", (), {"exists": lambda self: False, "__str__": lambda self: "/fake/.gitconfig"}
-        )()
-        mock_home.__truediv__ = lambda self, key: no_file
-
-        result = await tool.execute(
-            {
-                "operation": "create",
-                "name": "test-amp-settings",
-                "purpose": "amplifier",
-                "forward_git": False,
-                "forward_gh": False,
-                "forward_ssh": False,
-                "dotfiles_skip": True,
-            },
-        )
+    result = await tool.execute(
+        _BASE_CREATE_PAYLOAD | {"name": "test-amp-settings", "purpose": "amplifier"},
+    )
 
     assert "provisioning_report" in result
     step_names = [e["name"] for e in result["provisioning_report"]]
@@ -1108,94 +747,42 @@ async def test_amplifier_settings_provisioned(tool: ContainersTool):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_gpu_preflight_nvidia_available(tool: ContainersTool):
-    """GPU check reports nvidia available when runtime has it."""
-
-    async def _mock_run(*args: str, **kwargs: object) -> CommandResult:
-        if "info" in args and "--format" in args:
-            return CommandResult(
-                returncode=0,
-                stdout="map[io.containerd.runc.v2:{} nvidia:{}]",
-                stderr="",
-            )
-        return CommandResult(returncode=0, stdout="", stderr="")
-
-    tool.runtime.run = _mock_run  # type: ignore[assignment]
-    tool.runtime._runtime = "docker"
-
-    result = await tool.execute({"operation": "preflight"})
-    gpu_check = next(c for c in result["checks"] if c["name"] == "gpu_runtime")
-    assert gpu_check["passed"] is True
-    assert "NVIDIA runtime available" in gpu_check["detail"]
-
-
-@pytest.mark.asyncio
-async def test_gpu_preflight_nvidia_unavailable(tool: ContainersTool):
-    """GPU check reports unavailable but ready is still True."""
+@pytest.mark.parametrize(
+    ("runtime", "runtimes_stdout", "expected_detail", "has_guidance"),
+    [
+        ("docker", "map[io.containerd.runc.v2:{} nvidia:{}]", "NVIDIA runtime available", False),
+        ("docker", "map[io.containerd.runc.v2:{}]", "not detected", True),
+        ("podman", "", "not supported for Podman", False),
+    ],
+    ids=["nvidia_available", "nvidia_unavailable", "podman_skipped"],
+)
+async def test_gpu_preflight(
+    tool: ContainersTool, runtime, runtimes_stdout, expected_detail, has_guidance
+):
+    """GPU check reports what it finds but never affects ready (GPU is informational only)."""
+    runtimes_info = CommandResult(0, runtimes_stdout, "")
 
     async def _mock_run(*args: str, **kwargs: object) -> CommandResult:
         if "info" in args and "--format" in args:
-            return CommandResult(
-                returncode=0,
-                stdout="map[io.containerd.runc.v2:{}]",
-                stderr="",
-            )
-        return CommandResult(returncode=0, stdout="", stderr="")
+            return runtimes_info
+        return _OK_EMPTY
 
     tool.runtime.run = _mock_run  # type: ignore[assignment]
-    tool.runtime._runtime = "docker"
+    tool.runtime._runtime = runtime
 
     result = await tool.execute({"operation": "preflight"})
     assert result["ready"] is True  # CRITICAL: GPU absence doesn't break preflight
-    gpu_check = next(c for c in result["checks"] if c["name"] == "gpu_runtime")
-    assert gpu_check["passed"] is True
-    assert "not detected" in gpu_check["detail"]
-    assert gpu_check["guidance"] is not None
-
-
-@pytest.mark.asyncio
-async def test_gpu_preflight_podman_skipped(tool: ContainersTool):
-    """GPU check on Podman reports not supported."""
-
-    async def _mock_run(*args: str, **kwargs: object) -> CommandResult:
-        return CommandResult(returncode=0, stdout="", stderr="")
-
-    tool.runtime.run = _mock_run  # type: ignore[assignment]
-    tool.runtime._runtime = "podman"
-
-    result = await tool.execute({"operation": "preflight"})
-    gpu_check = next(c for c in result["checks"] if c["name"] == "gpu_runtime")
+    checks_by_name = {c["name"]: c for c in result["checks"]}
+    gpu_check = checks_by_name["gpu_runtime"]
     assert gpu_check["passed"] is True
-    assert "not supported for Podman" in gpu_check["detail"]
-
-
-@pytest.mark.asyncio
-async def test_gpu_check_does_not_affect_ready(tool: ContainersTool):
-    """ready=True even when GPU is unavailable — GPU is informational only."""
-
-    async def _mock_run(*args: str, **kwargs: object) -> CommandResult:
-        if "info" in args and "--format" in args:
-            return CommandResult(
-                returncode=0,
-                stdout="map[io.containerd.runc.v2:{}]",
-                stderr="",
-            )
-        return CommandResult(returncode=0, stdout="", stderr="")
-
-    tool.runtime.run = _mock_run  # type: ignore[assignment]
-    tool.runtime._runtime = "docker"
-
-    result = await tool.execute({"operation": "preflight"})
-    assert result["ready"] is True
+    assert expected_detail in gpu_check["detail"]
+    assert (gpu_check["guidance"] is not None) is has_guidance
 
 
-def test_gpu_flag_in_create_schema():
+def test_gpu_flag_in_create_schema(tool_schema):
     """Regression guard: gpu parameter exists in tool schema."""
-    t = ContainersTool()
-    schema = t.tool_definitions[0]["input_schema"]
-    assert "gpu" in schema["properties"]
-    assert schema["properties"]["gpu"]["type"] == "boolean"
+    assert "gpu" in tool_schema["properties"]
+    assert tool_schema["properties"]["gpu"]["type"] == "boolean"
 
 
 # ---------------------------------------------------------------------------
@@ -1203,56 +790,19 @@ def test_gpu_flag_in_create_schema():
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_wait_healthy_succeeds_first_attempt(tool: ContainersTool):
-    """wait_healthy returns healthy=True when check passes immediately."""
-
-    async def _mock_run(*args, **kwargs):
-        return CommandResult(returncode=0, stdout="ready", stderr="")
-
-    tool.runtime.run = _mock_run
-    result = await tool.execute(
-        {
-            "operation": "wait_healthy",
-            "container": "test-db",
-            "health_command": "pg_isready",
-        },
-    )
-    assert result["healthy"] is True
-    assert result["attempts"] == 1
-
-
-@pytest.mark.asyncio
-async def test_wait_healthy_succeeds_after_retries(tool: ContainersTool):
-    """wait_healthy returns healthy=True after some failed attempts."""
-    call_count = 0
-
-    async def _mock_run(*args, **kwargs):
-        nonlocal call_count
-        call_count += 1
-        if call_count < 3:
-            return CommandResult(returncode=1, stdout="", stderr="not ready")
-        return CommandResult(returncode=0, stdout="ready", stderr="")
-
-    tool.runtime.run = _mock_run
-    result = await tool.execute(
-        {
-            "operation": "wait_healthy",
-            "container": "test-db",
-            "health_command": "pg_isready",
-            "interval": 0,
-        },
-    )
-    assert result["healthy"] is True
-    assert result["attempts"] == 3
-
-
-@pytest.mark.asyncio
-async def test_wait_healthy_exhausts_retries(tool: ContainersTool):
-    """wait_healthy returns healthy=False when all retries fail."""
+@pytest.mark.parametrize(
+    ("fail_count", "retries", "healthy", "attempts"),
+    [(0, 5, True, 1), (2, 5, True, 3), (3, 3, False, 3)],
+    ids=["first_attempt", "after_retries", "exhausts_retries"],
+)
+async def test_wait_healthy(
+    tool: ContainersTool, fast_sleep, fail_count, retries, healthy, attempts
+):
+    """wait_healthy retries a failing check until it passes or retries run out."""
+    results = iter([_REFUSED] * fail_count)
 
     async def _mock_run(*args, **kwargs):
-        return CommandResult(returncode=1, stdout="", stderr="connection refused")
+        return next(results, _READY)
 
     tool.runtime.run = _mock_run
     result = await tool.execute(
@@ -1260,32 +810,20 @@ async def test_wait_healthy_exhausts_retries(tool: ContainersTool):
             "operation": "wait_healthy",
             "container": "test-db",
             "health_command": "pg_isready",
-            "interval": 0,
-            "retries": 3,
-        },
-    )
-    assert result["healthy"] is False
-    assert result["attempts"] == 3
-    assert "connection refused" in result["last_error"]
-
-
-@pytest.mark.asyncio
-async def test_wait_healthy_requires_params(tool: ContainersTool):
-    """wait_healthy returns error if container or health_command missing."""
-    result = await tool.execute(
-        {
-            "operation": "wait_healthy",
-            "container": "test-db",
+            "retries": retries,
         },
     )
-    assert "error" in result
+    assert result["healthy"] is healthy
+    assert result["attempts"] == attempts
+    if not healthy:
+        assert "connection refused" in result["last_error"]
+    # Waits the default 2s interval between attempts, but not after the last one
+    assert fast_sleep == [2] * min(fail_count, retries - 1)
 
 
-def test_wait_healthy_in_schema():
+def test_wait_healthy_in_schema(tool_schema):
     """wait_healthy is in the operation enum."""
-    t = ContainersTool()
-    schema = t.tool_definitions[0]["input_schema"]
-    ops = schema["properties"]["operation"]["enum"]
+    ops = tool_schema["properties"]["operation"]["enum"]
     assert "wait_healthy" in ops
 
 
@@ -1294,18 +832,14 @@ def test_wait_healthy_in_schema():
 # ---------------------------------------------------------------------------
 
 
-def test_repos_in_schema():
+def test_repos_in_schema(tool_schema):
     """repos parameter is in the tool schema."""
-    t = ContainersTool()
-    schema = t.tool_definitions[0]["input_schema"]
-    assert "repos" in schema["properties"]
+    assert "repos" in tool_schema["properties"]
 
 
-def test_config_files_in_schema():
+def test_config_files_in_schema(tool_schema):
     """config_files parameter is in the tool schema."""
-    t = ContainersTool()
-    schema = t.tool_definitions[0]["input_schema"]
-    assert "config_files" in schema["properties"]
+    assert "config_files" in tool_schema["properties"]
 
 
 # ---------------------------------------------------------------------------
@@ -1313,21 +847,16 @@ def test_config_files_in_schema():
 # ---------------------------------------------------------------------------
 
 
-def test_compose_content_in_schema():
+def test_compose_content_in_schema(tool_schema):
     """compose_content is in the tool schema."""
-    t = ContainersTool()
-    schema = t.tool_definitions[0]["input_schema"]
-    assert "compose_content" in schema["properties"]
+    assert "compose_content" in tool_schema["properties"]
 
 
-def test_compose_file_in_schema():
+def test_compose_file_in_schema(tool_schema):
     """compose_file is in the tool schema."""
-    t = ContainersTool()
-    schema = t.tool_definitions[0]["input_schema"]
-    assert "compose_file" in schema["properties"]
+    assert "compose_file" in tool_schema["properties"]
 
 
-@pytest.mark.asyncio
 async def test_create_compose_content_and_file_error(tool: ContainersTool):
     """Providing both compose_content and compose_file returns error."""
     tool._preflight_passed = True
@@ -1343,8 +872,7 @@ async def test_create_compose_content_and_file_error(tool: ContainersTool):
     assert "not both" in result["error"]
 
 
-@pytest.mark.asyncio
-async def test_create_with_compose_content(tool: ContainersTool):
+async def test_create_with_compose_content(tool: ContainersTool, no_user_files):
     """compose_content triggers compose up and joins the compose network."""
     tool._preflight_passed = True
     commands_run: list[list[str]] = []
@@ -1356,7 +884,7 @@ async def test_create_with_compose_content(tool: ContainersTool):
             return CommandResult(returncode=0, stdout="v2.24.0", stderr="")
         # Handle compose up
         if "compose" in args and "up" in args:
-            return CommandResult(returncode=0, stdout="", stderr="")
+            return _OK_EMPTY
         # Handle network inspect
         if "network" in args and "inspect" in args:
             return CommandResult(returncode=0, stdout="[{}]", stderr="")
@@ -1371,32 +899,15 @@ async def test_create_with_compose_content(tool: ContainersTool):
         return CommandResult(returncode=0, stdout="container123\n", stderr="")
 
     tool.runtime.run = _mock_run  # type: ignore[assignment]
-    tool.provisioner.runtime.run = _mock_run  # type: ignore[assignment]
-
-    with (
-        patch("amplifier_module_tool_containers.provisioner.shutil.which", return_value=None),
-        patch("amplifier_module_tool_containers.provisioner.Path") as mock_path,
-    ):
-        mock_home = mock_path.home.return_value
-        no_file = type(
-            "FP",
-            (),
-            {"exists": lambda self: False, "__str__": lambda self: "/fake/.gitconfig"},
-        )()
-        mock_home.__truediv__ = lambda self, key: no_file
-
-        result = await tool.execute(
-            {
-                "operation": "create",
-                "name": "test-compose",
-                "compose_content": "services:\n  db:\n    image: postgres\n",
-                "mount_cwd": False,
-                "forward_git": False,
-                "forward_gh": False,
-                "forward_ssh": False,
-                "dotfiles_skip": True,
-            },
-        )
+
+    result = await tool.execute(
+        _BASE_CREATE_PAYLOAD
+        | {
+            "name": "test-compose",
+            "compose_content": "services:\n  db:\n    image: postgres\n",
+            "mount_cwd": False,
+        },
+    )
 
     assert result.get("success") or "error" not in result, f"Create failed: {result}"
     # Verify compose was involved
@@ -1404,7 +915,6 @@ async def test_create_with_compose_content(tool: ContainersTool):
     assert len(compose_calls) >= 2  # version check + up
 
 
-@pytest.mark.asyncio
 async def test_destroy_with_compose(tool: ContainersTool):
     """destroy runs compose down when container has compose_project in metadata."""
     # Set up metadata with compose project
@@ -1421,7 +931,7 @@ async def test_destroy_with_compose(tool: ContainersTool):
 
     async def _mock_run(*args: str, **kwargs: object) -> CommandResult:
         commands_run.append(list(args))
-        return CommandResult(returncode=0, stdout="", stderr="")
+        return _OK_EMPTY
 
     tool.runtime.run = _mock_run  # type: ignore[assignment]
 
@@ -1438,7 +948,6 @@ async def test_destroy_with_compose(tool: ContainersTool):
     assert len(compose_down_calls) >= 1
 
 
-@pytest.mark.asyncio
 async def test_status_includes_compose_services(tool: ContainersTool):
     """status includes compose_services when compose_project is in metadata."""
     tool.store.save(
@@ -1477,7 +986,7 @@ async def test_status_includes_compose_services(tool: ContainersTool):
                 stdout='[{"Service":"db","State":"running"}]',
                 stderr="",
             )
-        return CommandResult(returncode=0, stdout="", stderr="")
+        return _OK_EMPTY
 
     tool.runtime.run = _mock_run  # type: ignore[assignment]
 